@@ -1,7 +1,21 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from collections import Counter
+
+from motor import (
+    carregar_base_csv,
+    extrair_dezenas,
+    frequencia_absoluta,
+    score_por_numero,
+    classificar_quentes_frios,
+    gerar_jogos,
+    testar_historico,
+    contar_acertos,
+    matriz_dezenas,
+    avaliar_boloes,
+    simular_combinacoes,
+    ranking_boloes
+)
 
 # ======================================================
 # CONFIGURAÇÃO DA PÁGINA
@@ -28,63 +42,10 @@ URL_BASE_ONLINE = "https://raw.githubusercontent.com/robsonsucessoagoraloto/apli
 @st.cache_data(show_spinner=False)
 def carregar_base_online():
     try:
-        df = pd.read_csv(URL_BASE_ONLINE)
-        df.columns = [c.lower() for c in df.columns]
-        return df
+        return carregar_base_csv(URL_BASE_ONLINE)
     except Exception:
         return None
 
-# ======================================================
-# FUNÇÕES ESTATÍSTICAS
-# ======================================================
-def extrair_dezenas(df):
-    cols = df.columns[-15:]
-    return df[cols].astype(int).values.tolist()
-
-def frequencia_absoluta(jogos):
-    cont = Counter()
-    for j in jogos:
-        cont.update(j)
-    return cont
-
-def score_por_numero(freq, total):
-    return {n: freq.get(n, 0) / total for n in range(1, 26)}
-
-def classificar_quentes_frios(score, n_quentes, n_frios):
-    ranking = sorted(score.items(), key=lambda x: x[1], reverse=True)
-    quentes = [n for n, _ in ranking[:n_quentes]]
-    frios = [n for n, _ in ranking[-n_frios:]]
-    return quentes, frios
-
-def gerar_jogos(base, qtd, soma_min, soma_max, pares_min, pares_max):
-    jogos = []
-    tentativas = 0
-
-    while len(jogos) < qtd and tentativas < qtd * 2000:
-        jogo = sorted(int(n) for n in np.random.choice(base, 15, replace=False))
-        soma = sum(jogo)
-        pares = sum(1 for n in jogo if n % 2 == 0)
-
-        if soma_min <= soma <= soma_max and pares_min <= pares <= pares_max:
-            if jogo not in jogos:
-                jogos.append(jogo)
-
-        tentativas += 1
-
-    return jogos
-
-def testar_historico(jogos, historico):
-    dados = []
-    for i, jogo in enumerate(jogos, 1):
-        acertos = [len(set(jogo) & set(s)) for s in historico]
-        dados.append({
-            "Jogo": i,
-            "Média de acertos": round(np.mean(acertos), 2),
-            "Máx": max(acertos),
-            "Min": min(acertos)
-        })
-    return pd.DataFrame(dados)
-
 # ======================================================
 # SIDEBAR
 # ======================================================
@@ -115,8 +76,7 @@ else:
     st.info("Base online indisponível no momento. Envie um CSV manualmente.")
     arquivo = st.file_uploader("Upload CSV", type=["csv"])
     if arquivo:
-        df = pd.read_csv(arquivo)
-        df.columns = [c.lower() for c in df.columns]
+        df = carregar_base_csv(arquivo)
 
 if df is None:
     st.stop()
@@ -213,45 +173,39 @@ if entrada_bolao:
         else:
             st.success(f"Bolão válido com {len(bolao)} dezenas")
 
-            # Classificação quente / frio / neutro
-            bolao_quentes = [n for n in bolao if n in quentes]
-            bolao_frios = [n for n in bolao if n in frios]
-            bolao_neutros = [n for n in bolao if n not in quentes + frios]
+            avaliacao = avaliar_boloes(
+                [bolao], contar_acertos([bolao], jogos[-janela:]), score, quentes, frios
+            )[0]
 
+            # Classificação quente / frio / neutro
             col1, col2, col3 = st.columns(3)
 
             with col1:
                 st.subheader("🔥 Quentes no bolão")
-                st.write(bolao_quentes)
+                st.write(avaliacao["Quentes"])
 
             with col2:
                 st.subheader("❄️ Frios no bolão")
-                st.write(bolao_frios)
+                st.write(avaliacao["Frios"])
 
             with col3:
                 st.subheader("⚖️ Neutros no bolão")
-                st.write(bolao_neutros)
+                st.write(avaliacao["Neutros"])
 
             # Score médio do bolão
-            score_medio = np.mean([score[n] for n in bolao])
-            st.metric("📊 Score médio do bolão", round(score_medio, 4))
+            st.metric("📊 Score médio do bolão", avaliacao["Score médio"])
 
             # Simulação histórica
             st.subheader("🧪 Simulação histórica do bolão")
 
-            resultados = []
-            for sorteio in jogos[-janela:]:
-                acertos = len(set(bolao) & set(sorteio))
-                resultados.append(acertos)
-
-            df_bolao = pd.DataFrame(resultados, columns=["Acertos"])
-            distribuicao = df_bolao["Acertos"].value_counts().sort_index()
+            distribuicao = pd.Series(avaliacao["Distribuição"], name="Ocorrências")
+            distribuicao.index.name = "Acertos"
 
             st.write("Distribuição de acertos no histórico:")
-            st.dataframe(distribuicao.rename("Ocorrências"))
+            st.dataframe(distribuicao)
 
-            st.metric("Máximo de acertos", df_bolao["Acertos"].max())
-            st.metric("Média de acertos", round(df_bolao["Acertos"].mean(), 2))
+            st.metric("Máximo de acertos", avaliacao["Máximo de acertos"])
+            st.metric("Média de acertos", avaliacao["Média de acertos"])
 
             # Comparação com jogos gerados
             st.subheader("⚔️ Comparação: Bolão vs Jogos Gerados")
@@ -260,7 +214,7 @@ if entrada_bolao:
 
             col1, col2 = st.columns(2)
             with col1:
-                st.metric("Bolão (média)", round(df_bolao["Acertos"].mean(), 2))
+                st.metric("Bolão (média)", avaliacao["Média de acertos"])
             with col2:
                 st.metric("Jogos gerados (média)", round(media_gerados, 2))
 
@@ -447,23 +401,14 @@ if bolao:
 
     historico_ref = jogos[-qtd_sim_bolao:]
 
-    resultados = []
-    distribuicao = Counter()
-
-    for jogo in combinacoes:
-        acertos = [len(set(jogo) & set(s)) for s in historico_ref]
-        media = np.mean(acertos)
-        maximo = max(acertos)
+    medias, maximos, dist = simular_combinacoes(bolao, matriz_dezenas(historico_ref))
+    distribuicao = {a: int(c) for a, c in enumerate(dist) if c}
 
-        distribuicao.update(acertos)
-
-        resultados.append({
-            "Jogo": list(jogo),
-            "Média de acertos": round(media, 2),
-            "Máx": maximo
-        })
-
-    df_bolao = pd.DataFrame(resultados)
+    df_bolao = pd.DataFrame({
+        "Jogo": [list(jogo) for jogo in combinacoes],
+        "Média de acertos": np.round(medias, 2),
+        "Máx": maximos
+    })
 
     st.subheader("📊 Resultado Estatístico do Bolão")
     st.dataframe(df_bolao.sort_values("Média de acertos", ascending=False).head(10))
@@ -593,41 +538,7 @@ if boloes:
     st.success(f"{len(boloes)} bolões válidos carregados")
 
     historico_bt = jogos[-janela_backtest:]
-    resultados_boloes = []
-
-    for idx, bolao in enumerate(boloes, 1):
-        combinacoes = list(itertools.combinations(bolao, 15))
-
-        medias = []
-        maximos = []
-        dist = Counter()
-
-        for jogo in combinacoes:
-            acertos = [len(set(jogo) & set(s)) for s in historico_bt]
-            medias.append(np.mean(acertos))
-            maximos.append(max(acertos))
-            dist.update(acertos)
-
-        score_ia = (
-            np.mean(medias) * 2 +
-            np.mean(maximos) +
-            dist.get(13, 0) * 0.5 +
-            dist.get(14, 0) * 1 +
-            dist.get(15, 0) * 2
-        )
-
-        resultados_boloes.append({
-            "Bolão": f"Bolão {idx}",
-            "Qtd dezenas": len(bolao),
-            "Média acertos": round(np.mean(medias), 2),
-            "Máx histórico": max(maximos),
-            "Freq 13+": dist.get(13, 0) + dist.get(14, 0) + dist.get(15, 0),
-            "Score IA": round(score_ia, 2)
-        })
-
-    df_boloes = pd.DataFrame(resultados_boloes).sort_values(
-        "Score IA", ascending=False
-    )
+    df_boloes = pd.DataFrame(ranking_boloes(boloes, matriz_dezenas(historico_bt)))
 
     st.subheader("📊 Ranking dos Bolões (IA Estatística)")
     st.dataframe(df_boloes)
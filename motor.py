@@ -0,0 +1,251 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+from collections import Counter
+from math import comb
+
+# ======================================================
+# MOTOR ESTATÍSTICO (COMPARTILHADO: APP + SERVIÇO HTTP)
+# ======================================================
+# 🔹 Sem dependência de Streamlit: pode ser importado por qualquer interface
+# 🔹 Acertos calculados por multiplicação de matrizes 0/1 (jogos × sorteios)
+
+DEZENAS = 25
+DEZENAS_POR_JOGO = 15
+
+
+def carregar_base_csv(caminho):
+    df = pd.read_csv(caminho)
+    df.columns = [c.lower() for c in df.columns]
+    return df
+
+
+# ======================================================
+# FUNÇÕES ESTATÍSTICAS
+# ======================================================
+def extrair_dezenas(df):
+    cols = df.columns[-15:]
+    return df[cols].astype(int).values.tolist()
+
+def frequencia_absoluta(jogos):
+    cont = Counter()
+    for j in jogos:
+        cont.update(j)
+    return cont
+
+def score_por_numero(freq, total):
+    return {n: freq.get(n, 0) / total for n in range(1, 26)}
+
+def classificar_quentes_frios(score, n_quentes, n_frios):
+    ranking = sorted(score.items(), key=lambda x: x[1], reverse=True)
+    quentes = [n for n, _ in ranking[:n_quentes]]
+    frios = [n for n, _ in ranking[-n_frios:]]
+    return quentes, frios
+
+def limites_base(base):
+    # Menor/maior soma e quantidade de pares alcançáveis com 15 dezenas da base
+    ordenada = sorted(base)
+    pares = sum(1 for n in ordenada if n % 2 == 0)
+    impares = len(ordenada) - pares
+    return (
+        sum(ordenada[:15]),
+        sum(ordenada[-15:]),
+        max(0, 15 - impares),
+        min(15, pares)
+    )
+
+def gerar_jogos(base, qtd, soma_min, soma_max, pares_min, pares_max, max_tentativas=None):
+    jogos = []
+    tentativas = 0
+    if max_tentativas is None:
+        max_tentativas = qtd * 2000
+
+    while len(jogos) < qtd and tentativas < max_tentativas:
+        jogo = sorted(int(n) for n in np.random.choice(base, 15, replace=False))
+        soma = sum(jogo)
+        pares = sum(1 for n in jogo if n % 2 == 0)
+
+        if soma_min <= soma <= soma_max and pares_min <= pares <= pares_max:
+            if jogo not in jogos:
+                jogos.append(jogo)
+
+        tentativas += 1
+
+    return jogos
+
+# ======================================================
+# ACERTOS VETORIZADOS
+# ======================================================
+def matriz_dezenas(jogos):
+    # Linha i = indicador 0/1 das dezenas do jogo i (coluna n-1 = dezena n)
+    matriz = np.zeros((len(jogos), DEZENAS), dtype=np.float32)
+    for i, jogo in enumerate(jogos):
+        matriz[i, np.asarray(list(jogo), dtype=np.int64) - 1] = 1
+    return matriz
+
+def contar_acertos_matriz(matriz_jogos, matriz_historico):
+    return (matriz_jogos @ matriz_historico.T).astype(np.int64)
+
+def contar_acertos(jogos, historico):
+    return contar_acertos_matriz(matriz_dezenas(jogos), matriz_dezenas(historico))
+
+def resumo_historico(acertos):
+    if len(acertos) == 0:
+        return pd.DataFrame()
+
+    return pd.DataFrame({
+        "Jogo": np.arange(1, len(acertos) + 1),
+        "Média de acertos": np.round(acertos.mean(axis=1), 2),
+        "Máx": acertos.max(axis=1),
+        "Min": acertos.min(axis=1)
+    })
+
+def testar_historico(jogos, historico):
+    return resumo_historico(contar_acertos(jogos, historico))
+
+# ======================================================
+# AVALIAÇÃO DE BOLÃO (15 a 20 dezenas)
+# ======================================================
+def validar_inteiros(numeros):
+    # bool é subclasse de int: True/False não são dezenas
+    if not isinstance(numeros, (list, tuple)) or any(
+        isinstance(n, bool) or not isinstance(n, int) for n in numeros
+    ):
+        raise ValueError("As dezenas devem ser números inteiros.")
+    return list(numeros)
+
+def validar_bolao(numeros):
+    bolao = sorted(set(validar_inteiros(numeros)))
+
+    if not (15 <= len(bolao) <= 20):
+        raise ValueError("O bolão deve ter entre 15 e 20 dezenas.")
+    if any(n < 1 or n > 25 for n in bolao):
+        raise ValueError("As dezenas devem estar entre 1 e 25.")
+
+    return bolao
+
+def tabela_combinacoes(k):
+    # tabela[m, a] = jogos de 15 dezenas do bolão (k dezenas) com "a" acertos
+    # quando o sorteio acerta "m" dezenas do bolão
+    tabela = np.zeros((DEZENAS_POR_JOGO + 1, DEZENAS_POR_JOGO + 1), dtype=np.int64)
+    for m in range(min(k, DEZENAS_POR_JOGO) + 1):
+        for a in range(m + 1):
+            tabela[m, a] = comb(m, a) * comb(k - m, DEZENAS_POR_JOGO - a)
+    return tabela
+
+TABELAS_COMBINACOES = {k: tabela_combinacoes(k) for k in range(15, 21)}
+
+def distribuicao_acertos(acertos):
+    # Contagem de 0..15 acertos por linha, sem laço Python
+    linhas = len(acertos)
+    deslocado = acertos + np.arange(linhas)[:, None] * (DEZENAS_POR_JOGO + 1)
+    return np.bincount(
+        deslocado.ravel(), minlength=linhas * (DEZENAS_POR_JOGO + 1)
+    ).reshape(linhas, DEZENAS_POR_JOGO + 1)
+
+def avaliar_boloes(boloes, acertos, score, quentes, frios):
+    dist = distribuicao_acertos(acertos)
+    medias = acertos.mean(axis=1)
+    maximos = acertos.max(axis=1)
+
+    resultados = []
+    for bolao, d, media, maximo in zip(boloes, dist, medias, maximos):
+        resultados.append({
+            "Bolão": bolao,
+            "Qtd dezenas": len(bolao),
+            "Quentes": [n for n in bolao if n in quentes],
+            "Frios": [n for n in bolao if n in frios],
+            "Neutros": [n for n in bolao if n not in quentes + frios],
+            "Score médio": float(np.round(np.mean([score[n] for n in bolao]), 4)),
+            "Distribuição": {int(a): int(c) for a, c in enumerate(d) if c},
+            "Máximo de acertos": int(maximo),
+            "Média de acertos": float(np.round(media, 2))
+        })
+
+    return resultados
+
+# ======================================================
+# BACKTEST DAS COMBINAÇÕES DO BOLÃO (16–20 dezenas)
+# ======================================================
+# 🔹 Mesmos números do laço itertools.combinations × sorteios, sem o laço:
+#    média por combinação em forma fechada, máximo por produto de matrizes
+
+BLOCO_COMBINACOES = 2048
+
+def indicadores_combinacoes(k):
+    # Linha i = indicador 0/1 (posições no bolão) da i-ésima combinação de
+    # itertools.combinations(bolao, 15) — mesma ordem
+    indices = np.array(list(itertools.combinations(range(k), DEZENAS_POR_JOGO)))
+    indicadores = np.zeros((len(indices), k), dtype=np.float32)
+    np.put_along_axis(indicadores, indices, 1, axis=1)
+    return indicadores
+
+INDICADORES_COMBINACOES = {k: indicadores_combinacoes(k) for k in range(15, 21)}
+
+def simular_combinacoes(bolao, matriz_janela, acertos=None):
+    k = len(bolao)
+    sorteios = matriz_janela[:, np.asarray(bolao) - 1]
+    if acertos is None:
+        acertos = sorteios.sum(axis=1).astype(np.int64)
+
+    indicadores = INDICADORES_COMBINACOES[k]
+
+    # Média de cada combinação = acertos somados das suas dezenas / concursos
+    medias = (indicadores @ sorteios.sum(axis=0)).astype(np.float64) / len(sorteios)
+
+    # Máximo de cada combinação, por nível de acertos do sorteio no bolão
+    # (do maior para o menor). Uma combinação perde no máximo k-15 dezenas
+    # do melhor sorteio, então o piso é garantido; e uma combinação que já
+    # chegou a L-1 não melhora com sorteios de nível L-1 ou abaixo
+    teto = int(acertos.max())
+    maximos = np.full(len(indicadores), teto - (k - DEZENAS_POR_JOGO), dtype=np.int64)
+    pendentes = np.arange(len(indicadores))
+    for nivel in range(teto, teto - (k - DEZENAS_POR_JOGO), -1):
+        candidatos = sorteios[acertos == nivel].T
+        if candidatos.shape[1]:
+            for i in range(0, len(pendentes), BLOCO_COMBINACOES):
+                bloco = pendentes[i:i + BLOCO_COMBINACOES]
+                maximos[bloco] = np.maximum(
+                    maximos[bloco], (indicadores[bloco] @ candidatos).max(axis=1)
+                )
+        pendentes = pendentes[maximos[pendentes] < nivel - 1]
+
+    dist = np.bincount(acertos, minlength=DEZENAS_POR_JOGO + 1) @ TABELAS_COMBINACOES[k]
+
+    return medias, maximos, dist
+
+def backtest_bolao(bolao, matriz_janela, acertos=None):
+    medias, maximos, dist = simular_combinacoes(bolao, matriz_janela, acertos)
+
+    score_ia = (
+        np.mean(medias) * 2 +
+        np.mean(maximos) +
+        dist[13] * 0.5 +
+        dist[14] * 1 +
+        dist[15] * 2
+    )
+
+    return {
+        "Qtd dezenas": len(bolao),
+        "Média acertos": float(np.round(np.mean(medias), 2)),
+        "Máx histórico": int(maximos.max()),
+        "Freq 13+": int(dist[13:].sum()),
+        "Score IA": float(np.round(score_ia, 2))
+    }
+
+def backtest_boloes(boloes, matriz_janela, acertos=None):
+    return [
+        {
+            "Bolão": f"Bolão {idx}",
+            **backtest_bolao(bolao, matriz_janela, None if acertos is None else acertos[idx - 1])
+        }
+        for idx, bolao in enumerate(boloes, 1)
+    ]
+
+def ordenar_ranking(linhas):
+    # Ordenação estável: empates mantêm a ordem em que os bolões foram informados
+    return sorted(linhas, key=lambda r: r["Score IA"], reverse=True)
+
+def ranking_boloes(boloes, matriz_janela, acertos=None):
+    return ordenar_ranking(backtest_boloes(boloes, matriz_janela, acertos))
@@ -0,0 +1,471 @@
+import argparse
+import io
+import json
+import queue
+import socketserver
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from functools import lru_cache
+from math import comb
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+from wsgiref.util import setup_testing_defaults
+
+import numpy as np
+
+from motor import (
+    avaliar_boloes,
+    backtest_bolao,
+    carregar_base_csv,
+    classificar_quentes_frios,
+    contar_acertos_matriz,
+    extrair_dezenas,
+    frequencia_absoluta,
+    gerar_jogos,
+    limites_base,
+    matriz_dezenas,
+    ordenar_ranking,
+    resumo_historico,
+    score_por_numero,
+    validar_bolao,
+    validar_inteiros
+)
+
+# ======================================================
+# SERVIÇO HTTP LOCAL (PONTUAÇÃO DE BOLÕES E JOGOS)
+# ======================================================
+# 🔹 Mesmo motor do app Streamlit (motor.py)
+# 🔹 Histórico e tabelas ficam residentes em memória
+# 🔹 Pedidos simultâneos são agrupados num único produto de matrizes
+# 🔹 Uso: python servico.py --porta 8502
+
+CAMINHO_BASE = "lotofacil_resultados.csv"
+
+MAX_BOLOES_POR_PEDIDO = 1000
+# Ranking: orçamento por soma de C(k, 15), não por quantidade de bolões
+# (um bolão de 20 dezenas vale 15504 combinações; um de 16, só 16)
+MAX_COMBINACOES_POR_PEDIDO = 200_000
+TAMANHO_CACHE_RANKING = 4096
+MAX_JOGOS_POR_PEDIDO = 1000
+MAX_JOGOS_GERADOS = 50
+MAX_TENTATIVAS_GERACAO = 10000
+
+
+# ======================================================
+# MÉTRICAS (VAZÃO / LATÊNCIA / LOTES)
+# ======================================================
+class Metricas:
+    def __init__(self, amostras=10000, janela_vazao=10.0):
+        self._lock = threading.Lock()
+        self._inicio = time.monotonic()
+        self._latencias = deque(maxlen=amostras)
+        # Instantes dos pedidos dos últimos `janela_vazao` segundos (vazão atual)
+        self._janela_vazao = janela_vazao
+        self._recentes = deque()
+        self._pedidos = {}
+        self._erros = 0
+        self._lotes = 0
+        self._pedidos_em_lotes = 0
+        self._linhas_em_lotes = 0
+
+    def _descartar_antigos(self, agora):
+        limite = agora - self._janela_vazao
+        while self._recentes and self._recentes[0] < limite:
+            self._recentes.popleft()
+
+    def registrar_pedido(self, rota, segundos, erro=False):
+        with self._lock:
+            agora = time.monotonic()
+            self._recentes.append(agora)
+            self._descartar_antigos(agora)
+            self._pedidos[rota] = self._pedidos.get(rota, 0) + 1
+            self._latencias.append(segundos)
+            if erro:
+                self._erros += 1
+
+    def registrar_lote(self, pedidos, linhas):
+        with self._lock:
+            self._lotes += 1
+            self._pedidos_em_lotes += pedidos
+            self._linhas_em_lotes += linhas
+
+    def instantaneo(self):
+        with self._lock:
+            agora = time.monotonic()
+            self._descartar_antigos(agora)
+            decorrido = agora - self._inicio
+            janela = min(self._janela_vazao, decorrido)
+            total = sum(self._pedidos.values())
+            latencias = np.array(self._latencias, dtype=np.float64) * 1000
+            lotes = self._lotes
+
+            return {
+                "Tempo ativo (s)": round(decorrido, 3),
+                "Pedidos": total,
+                "Pedidos por rota": dict(self._pedidos),
+                "Erros": self._erros,
+                "Pedidos por segundo (atual)":
+                    round(len(self._recentes) / janela, 2) if janela else 0.0,
+                "Janela da vazão atual (s)": self._janela_vazao,
+                "Pedidos por segundo (média desde o início)":
+                    round(total / decorrido, 2) if decorrido else 0.0,
+                "Latência (ms)": {
+                    "Média": round(float(latencias.mean()), 3),
+                    "p50": round(float(np.percentile(latencias, 50)), 3),
+                    "p95": round(float(np.percentile(latencias, 95)), 3),
+                    "p99": round(float(np.percentile(latencias, 99)), 3),
+                    "Máx": round(float(latencias.max()), 3)
+                } if len(latencias) else {},
+                "Lotes": lotes,
+                "Pedidos por lote": round(self._pedidos_em_lotes / lotes, 2) if lotes else 0.0,
+                "Linhas por lote": round(self._linhas_em_lotes / lotes, 2) if lotes else 0.0
+            }
+
+
+# ======================================================
+# AGRUPADOR DE PEDIDOS (LOTES VETORIZADOS)
+# ======================================================
+class AgrupadorLotes:
+    def __init__(self, matriz_historico, metricas, max_linhas=4096, espera_max=0.001):
+        self._historico = matriz_historico
+        self._metricas = metricas
+        self._max_linhas = max_linhas
+        self._espera_max = espera_max
+        self._fila = queue.Queue()
+        self._lock = threading.Lock()
+        self._fechado = False
+        self._thread = threading.Thread(target=self._laco, daemon=True)
+        self._thread.start()
+
+    def acertos(self, matriz_jogos, janela):
+        futuro = Future()
+        # Checagem e enfileiramento sob o mesmo lock: nada entra na fila
+        # depois da sentinela de encerramento
+        with self._lock:
+            if self._fechado:
+                raise RuntimeError("Agrupador de lotes encerrado.")
+            self._fila.put((matriz_jogos, janela, futuro))
+        return futuro.result()
+
+    def fechar(self):
+        with self._lock:
+            if self._fechado:
+                return
+            self._fechado = True
+            self._fila.put(None)
+        self._thread.join()
+
+    def _coletar(self, primeiro):
+        lote = [primeiro]
+        linhas = len(primeiro[0])
+        limite = time.monotonic() + self._espera_max
+
+        while linhas < self._max_linhas:
+            restante = limite - time.monotonic()
+            try:
+                item = self._fila.get(timeout=restante) if restante > 0 else self._fila.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._fila.put(None)
+                break
+            lote.append(item)
+            linhas += len(item[0])
+
+        return lote, linhas
+
+    def _laco(self):
+        while True:
+            primeiro = self._fila.get()
+            if primeiro is None:
+                return
+
+            lote, linhas = self._coletar(primeiro)
+
+            try:
+                # Um único produto contra a maior janela do lote; cada pedido
+                # recebe só as colunas da sua janela
+                janela_max = max(janela for _, janela, _ in lote)
+                acertos = contar_acertos_matriz(
+                    np.vstack([m for m, _, _ in lote]),
+                    self._historico[-janela_max:]
+                )
+                inicio = 0
+                for matriz, janela, futuro in lote:
+                    fim = inicio + len(matriz)
+                    futuro.set_result(acertos[inicio:fim, janela_max - janela:])
+                    inicio = fim
+            except Exception as e:
+                for _, _, futuro in lote:
+                    if not futuro.done():
+                        futuro.set_exception(e)
+
+            self._metricas.registrar_lote(len(lote), linhas)
+
+
+# ======================================================
+# SERVIÇO (ESTADO RESIDENTE)
+# ======================================================
+def _inteiro(dados, chave, padrao):
+    valor = dados.get(chave, padrao)
+    if isinstance(valor, bool) or not isinstance(valor, int):
+        raise ValueError(f"O campo '{chave}' deve ser um número inteiro.")
+    return valor
+
+class ServicoLotofacil:
+    def __init__(self, historico, max_linhas=4096, espera_max=0.001):
+        self.historico = historico
+        self.matriz_historico = matriz_dezenas(historico)
+        self.score = score_por_numero(frequencia_absoluta(historico), len(historico))
+        self.metricas = Metricas()
+        self.agrupador = AgrupadorLotes(
+            self.matriz_historico, self.metricas, max_linhas, espera_max
+        )
+        # Histórico residente e imutável: o backtest de (bolão, janela) não muda
+        self.backtest = lru_cache(maxsize=TAMANHO_CACHE_RANKING)(self._backtest)
+
+    def _backtest(self, bolao, janela):
+        return backtest_bolao(list(bolao), self.matriz_historico[-janela:])
+
+    @classmethod
+    def de_csv(cls, caminho=CAMINHO_BASE, **kwargs):
+        return cls(extrair_dezenas(carregar_base_csv(caminho)), **kwargs)
+
+    def fechar(self):
+        self.agrupador.fechar()
+
+    def _janela(self, dados):
+        janela = _inteiro(dados, "janela", 300)
+        if not (1 <= janela <= len(self.historico)):
+            raise ValueError(f"A janela deve estar entre 1 e {len(self.historico)} concursos.")
+        return janela
+
+    def _quentes_frios(self, dados):
+        n_quentes = _inteiro(dados, "quentes", 8)
+        n_frios = _inteiro(dados, "frios", 7)
+        if not (1 <= n_quentes <= 25 and 1 <= n_frios <= 25):
+            raise ValueError("Quentes e frios devem estar entre 1 e 25.")
+        return classificar_quentes_frios(self.score, n_quentes, n_frios)
+
+    def pontuar_boloes(self, dados):
+        boloes = [validar_bolao(b) for b in dados.get("boloes", [])]
+        if not (1 <= len(boloes) <= MAX_BOLOES_POR_PEDIDO):
+            raise ValueError(f"Informe entre 1 e {MAX_BOLOES_POR_PEDIDO} bolões.")
+
+        com_ranking = dados.get("ranking", False)
+        if not isinstance(com_ranking, bool):
+            raise ValueError("O campo 'ranking' deve ser true ou false.")
+
+        combinacoes = sum(comb(len(b), 15) for b in boloes) if com_ranking else 0
+        if combinacoes > MAX_COMBINACOES_POR_PEDIDO:
+            raise ValueError(
+                f"Ranking limitado a {MAX_COMBINACOES_POR_PEDIDO} combinações por pedido "
+                f"(pedido: {combinacoes}). Divida os bolões em mais pedidos."
+            )
+
+        janela = self._janela(dados)
+        quentes, frios = self._quentes_frios(dados)
+        acertos = self.agrupador.acertos(matriz_dezenas(boloes), janela)
+
+        # Mesmas funções do app: análise do bolão e, sob pedido, ranking por Score IA
+        resposta = {"resultados": avaliar_boloes(boloes, acertos, self.score, quentes, frios)}
+        if com_ranking:
+            resposta["ranking"] = ordenar_ranking([
+                {"Bolão": f"Bolão {idx}", **self.backtest(tuple(bolao), janela)}
+                for idx, bolao in enumerate(boloes, 1)
+            ])
+        return resposta
+
+    def testar_historico(self, dados):
+        jogos = [sorted(set(validar_inteiros(j))) for j in dados.get("jogos", [])]
+        if not (1 <= len(jogos) <= MAX_JOGOS_POR_PEDIDO):
+            raise ValueError(f"Informe entre 1 e {MAX_JOGOS_POR_PEDIDO} jogos.")
+        if any(len(j) != 15 or j[0] < 1 or j[-1] > 25 for j in jogos):
+            raise ValueError("Cada jogo deve ter 15 dezenas distintas entre 1 e 25.")
+
+        janela = self._janela(dados)
+        acertos = self.agrupador.acertos(matriz_dezenas(jogos), janela)
+
+        return {"resultados": resumo_historico(acertos).to_dict("records")}
+
+    def gerar_jogos(self, dados):
+        qtd = _inteiro(dados, "qtd", 20)
+        if not (1 <= qtd <= MAX_JOGOS_GERADOS):
+            raise ValueError(f"A quantidade de jogos deve estar entre 1 e {MAX_JOGOS_GERADOS}.")
+
+        quentes, frios = self._quentes_frios(dados)
+        base = sorted(set(quentes + frios))
+        if len(base) < 15:
+            raise ValueError("Base insuficiente. Ajuste quentes/frios.")
+
+        soma_min = _inteiro(dados, "soma_min", 190)
+        soma_max = _inteiro(dados, "soma_max", 240)
+        pares_min = _inteiro(dados, "pares_min", 6)
+        pares_max = _inteiro(dados, "pares_max", 9)
+
+        if soma_min > soma_max or pares_min > pares_max:
+            raise ValueError("Faixas invertidas: mínimo maior que máximo.")
+
+        # Faixa fora do alcançável pela base: recusa antes de sortear
+        soma_base_min, soma_base_max, pares_base_min, pares_base_max = limites_base(base)
+        if soma_max < soma_base_min or soma_min > soma_base_max:
+            raise ValueError(
+                f"Soma impossível para a base: use valores entre {soma_base_min} e {soma_base_max}."
+            )
+        if pares_max < pares_base_min or pares_min > pares_base_max:
+            raise ValueError(
+                f"Pares impossíveis para a base: use valores entre {pares_base_min} e {pares_base_max}."
+            )
+
+        jogos = gerar_jogos(
+            base,
+            qtd,
+            soma_min,
+            soma_max,
+            pares_min,
+            pares_max,
+            max_tentativas=MAX_TENTATIVAS_GERACAO
+        )
+
+        return {"base": base, "jogos": jogos}
+
+
+# ======================================================
+# APLICAÇÃO WSGI
+# ======================================================
+def _json(status, corpo, start_response):
+    dados = json.dumps(corpo, ensure_ascii=False, default=lambda o: o.item()).encode("utf-8")
+    start_response(status, [
+        ("Content-Type", "application/json; charset=utf-8"),
+        ("Content-Length", str(len(dados)))
+    ])
+    return [dados]
+
+def criar_aplicacao(servico):
+    rotas_get = {
+        "/saude": lambda: {"status": "ok", "concursos": len(servico.historico)},
+        "/metricas": lambda: {
+            **servico.metricas.instantaneo(),
+            "Cache do ranking": servico.backtest.cache_info()._asdict()
+        }
+    }
+    rotas_post = {
+        "/boloes": servico.pontuar_boloes,
+        "/historico": servico.testar_historico,
+        "/jogos": servico.gerar_jogos
+    }
+
+    def aplicacao(environ, start_response):
+        inicio = time.perf_counter()
+        metodo = environ["REQUEST_METHOD"]
+        rota = environ.get("PATH_INFO", "/")
+        erro = False
+
+        try:
+            if rota in rotas_get:
+                if metodo != "GET":
+                    erro = True
+                    return _json("405 Method Not Allowed", {"erro": "Use GET."}, start_response)
+                return _json("200 OK", rotas_get[rota](), start_response)
+
+            if rota not in rotas_post:
+                erro = True
+                return _json("404 Not Found", {"erro": "Rota inexistente."}, start_response)
+
+            if metodo != "POST":
+                erro = True
+                return _json("405 Method Not Allowed", {"erro": "Use POST."}, start_response)
+
+            try:
+                tamanho = int(environ.get("CONTENT_LENGTH") or 0)
+                dados = json.loads(environ["wsgi.input"].read(tamanho) or b"{}")
+                if not isinstance(dados, dict):
+                    raise ValueError("O corpo deve ser um objeto JSON.")
+                return _json("200 OK", rotas_post[rota](dados), start_response)
+            except (ValueError, TypeError) as e:
+                erro = True
+                return _json("400 Bad Request", {"erro": str(e)}, start_response)
+
+        except Exception as e:
+            erro = True
+            return _json("500 Internal Server Error", {"erro": str(e)}, start_response)
+
+        finally:
+            rotulo = rota if rota in rotas_get or rota in rotas_post else "outras"
+            servico.metricas.registrar_pedido(rotulo, time.perf_counter() - inicio, erro)
+
+    return aplicacao
+
+
+# ======================================================
+# CLIENTE EM PROCESSO (TESTES SEM REDE)
+# ======================================================
+class ClienteLocal:
+    def __init__(self, aplicacao):
+        self.aplicacao = aplicacao
+
+    def requisitar(self, metodo, rota, corpo=None):
+        dados = json.dumps(corpo).encode("utf-8") if corpo is not None else b""
+        environ = {
+            "REQUEST_METHOD": metodo,
+            "PATH_INFO": rota,
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(dados)),
+            "wsgi.input": io.BytesIO(dados)
+        }
+        setup_testing_defaults(environ)
+
+        resposta = {}
+
+        def start_response(status, cabecalhos):
+            resposta["status"] = int(status.split()[0])
+
+        conteudo = b"".join(self.aplicacao(environ, start_response))
+        return resposta["status"], json.loads(conteudo)
+
+    def get(self, rota):
+        return self.requisitar("GET", rota)
+
+    def post(self, rota, corpo):
+        return self.requisitar("POST", rota, corpo)
+
+
+# ======================================================
+# SERVIDOR
+# ======================================================
+class ServidorWSGIThreads(socketserver.ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class ManipuladorSilencioso(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def servir(host="127.0.0.1", porta=8502, caminho=CAMINHO_BASE):
+    servico = ServicoLotofacil.de_csv(caminho)
+    servidor = make_server(
+        host, porta, criar_aplicacao(servico),
+        server_class=ServidorWSGIThreads,
+        handler_class=ManipuladorSilencioso
+    )
+    print(f"Serviço Lotofácil em http://{host}:{porta} ({len(servico.historico)} concursos)")
+
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        servico.fechar()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serviço HTTP local da Lotofácil")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8502)
+    parser.add_argument("--base", default=CAMINHO_BASE)
+    args = parser.parse_args()
+
+    servir(args.host, args.porta, args.base)
@@ -0,0 +1,295 @@
+import itertools
+import os
+import threading
+import time
+import unittest
+from collections import Counter
+
+import numpy as np
+
+from motor import (
+    carregar_base_csv,
+    contar_acertos,
+    extrair_dezenas,
+    matriz_dezenas,
+    simular_combinacoes,
+    testar_historico as motor_testar_historico
+)
+from servico import ClienteLocal, Metricas, ServicoLotofacil, criar_aplicacao
+
+# ======================================================
+# TESTES DO SERVIÇO (CLIENTE EM PROCESSO, SEM REDE)
+# ======================================================
+# 🔹 python -m pytest -q   (ou: python -m unittest test_servico)
+
+CAMINHO_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lotofacil_resultados.csv")
+
+HISTORICO = extrair_dezenas(carregar_base_csv(CAMINHO_BASE))
+
+
+def backtest_forca_bruta(bolao, historico):
+    # Laço original do app: cada combinação de 15 contra cada sorteio
+    medias = []
+    maximos = []
+    dist = Counter()
+
+    for jogo in itertools.combinations(bolao, 15):
+        acertos = [len(set(jogo) & set(s)) for s in historico]
+        medias.append(np.mean(acertos))
+        maximos.append(max(acertos))
+        dist.update(acertos)
+
+    score_ia = (
+        np.mean(medias) * 2 +
+        np.mean(maximos) +
+        dist.get(13, 0) * 0.5 +
+        dist.get(14, 0) * 1 +
+        dist.get(15, 0) * 2
+    )
+
+    return medias, maximos, dist, {
+        "Média acertos": round(np.mean(medias), 2),
+        "Máx histórico": max(maximos),
+        "Freq 13+": dist.get(13, 0) + dist.get(14, 0) + dist.get(15, 0),
+        "Score IA": round(score_ia, 2)
+    }
+
+
+class TestServico(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Espera longa no agrupador para que pedidos simultâneos caiam no mesmo lote
+        cls.servico = ServicoLotofacil(HISTORICO, espera_max=0.2)
+        cls.cliente = ClienteLocal(criar_aplicacao(cls.servico))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.servico.fechar()
+
+    def test_combinacoes_iguais_a_forca_bruta(self):
+        rng = np.random.default_rng(26)
+        janela = 40
+        historico = HISTORICO[-janela:]
+
+        for k in range(15, 21):
+            bolao = sorted(rng.choice(np.arange(1, 26), k, replace=False).tolist())
+            medias, maximos, dist, esperado = backtest_forca_bruta(bolao, historico)
+
+            m, x, d = simular_combinacoes(bolao, matriz_dezenas(historico))
+            np.testing.assert_array_equal(m, medias)
+            np.testing.assert_array_equal(x, maximos)
+            self.assertEqual({a: int(c) for a, c in enumerate(d) if c}, dict(dist))
+
+            status, corpo = self.cliente.post(
+                "/boloes", {"boloes": [bolao], "janela": janela, "ranking": True}
+            )
+            self.assertEqual(status, 200)
+            linha = corpo["ranking"][0]
+            for chave, valor in esperado.items():
+                self.assertEqual(linha[chave], valor, (k, chave))
+
+            acertos = [len(set(bolao) & set(s)) for s in historico]
+            avaliacao = corpo["resultados"][0]
+            self.assertEqual(avaliacao["Máximo de acertos"], max(acertos))
+            self.assertEqual(avaliacao["Média de acertos"], round(np.mean(acertos), 2))
+
+    def test_ranking_sob_pedido_com_orcamento_e_cache(self):
+        bolao = list(range(1, 21))
+
+        status, corpo = self.cliente.post("/boloes", {"boloes": [bolao], "janela": 300})
+        self.assertEqual(status, 200)
+        self.assertNotIn("ranking", corpo)
+
+        # 13 bolões de 20 dezenas = 201552 combinações, acima do orçamento
+        status, corpo = self.cliente.post("/boloes", {"boloes": [bolao] * 13, "ranking": True})
+        self.assertEqual(status, 400)
+        self.assertIn("combinações", corpo["erro"])
+
+        status, corpo = self.cliente.post("/boloes", {"boloes": [bolao], "ranking": "sim"})
+        self.assertEqual(status, 400)
+
+        antes = self.servico.backtest.cache_info().hits
+        for _ in range(2):
+            status, corpo = self.cliente.post(
+                "/boloes", {"boloes": [bolao, bolao], "janela": 250, "ranking": True}
+            )
+            self.assertEqual(status, 200)
+        self.assertEqual(self.servico.backtest.cache_info().hits - antes, 3)
+        self.assertEqual([r["Bolão"] for r in corpo["ranking"]], ["Bolão 1", "Bolão 2"])
+
+    def test_historico_igual_a_testar_historico(self):
+        jogos = [list(range(1, 16)), list(range(11, 26))]
+        status, corpo = self.cliente.post("/historico", {"jogos": jogos, "janela": 120})
+
+        self.assertEqual(status, 200)
+        self.assertEqual(corpo["resultados"], motor_testar_historico(jogos, HISTORICO[-120:]).to_dict("records"))
+
+    def test_lote_com_janelas_diferentes(self):
+        janelas = [1, 50, 300, 777, len(HISTORICO)]
+        jogos = [list(range(i, i + 15)) for i in range(1, 11)]
+        barreira = threading.Barrier(len(janelas))
+        respostas = {}
+
+        def pedir(janela):
+            barreira.wait()
+            respostas[janela] = self.cliente.post("/historico", {"jogos": jogos, "janela": janela})
+
+        lotes_antes = self.servico.metricas.instantaneo()["Lotes"]
+        threads = [threading.Thread(target=pedir, args=(j,)) for j in janelas]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # Agrupados: menos lotes do que pedidos
+        self.assertLess(self.servico.metricas.instantaneo()["Lotes"] - lotes_antes, len(janelas))
+
+        for janela in janelas:
+            status, corpo = respostas[janela]
+            self.assertEqual(status, 200)
+            esperado = contar_acertos(jogos, HISTORICO[-janela:])
+            self.assertEqual([r["Máx"] for r in corpo["resultados"]], esperado.max(axis=1).tolist())
+            self.assertEqual([r["Min"] for r in corpo["resultados"]], esperado.min(axis=1).tolist())
+            self.assertEqual(
+                [r["Média de acertos"] for r in corpo["resultados"]],
+                np.round(esperado.mean(axis=1), 2).tolist()
+            )
+
+    def test_erros_400(self):
+        bolao = list(range(1, 17))
+        casos = [
+            ("/boloes", {"boloes": [[1, 2, 3]]}),
+            ("/boloes", {"boloes": [[1.7] + bolao[1:]]}),
+            ("/boloes", {"boloes": [[True] + bolao[1:]]}),
+            ("/boloes", {"boloes": [bolao], "janela": 0}),
+            ("/boloes", {"boloes": []}),
+            ("/historico", {"jogos": [list(range(1, 15))]}),
+            ("/jogos", {"qtd": 50, "soma_min": 400, "soma_max": 500}),
+            ("/jogos", {"soma_min": 240, "soma_max": 190}),
+            ("/jogos", {"pares_min": 9, "pares_max": 6}),
+            ("/jogos", {"qtd": 0})
+        ]
+
+        for rota, corpo in casos:
+            status, resposta = self.cliente.post(rota, corpo)
+            self.assertEqual(status, 400, (rota, corpo))
+            self.assertIn("erro", resposta)
+
+        status, _ = self.cliente.requisitar("POST", "/boloes", None)
+        self.assertEqual(status, 400)
+
+    def test_erros_404_405(self):
+        self.assertEqual(self.cliente.get("/inexistente")[0], 404)
+        self.assertEqual(self.cliente.post("/inexistente", {})[0], 404)
+        self.assertEqual(self.cliente.get("/boloes")[0], 405)
+        self.assertEqual(self.cliente.post("/saude", {})[0], 405)
+        self.assertEqual(self.cliente.post("/metricas", {})[0], 405)
+
+    def test_metricas_contam_lotes(self):
+        antes = self.cliente.get("/metricas")[1]
+
+        for _ in range(3):
+            self.assertEqual(self.cliente.post("/boloes", {"boloes": [list(range(1, 17))]})[0], 200)
+
+        status, depois = self.cliente.get("/metricas")
+        self.assertEqual(status, 200)
+        self.assertEqual(depois["Lotes"] - antes["Lotes"], 3)
+        self.assertEqual(depois["Pedidos por rota"]["/boloes"] - antes["Pedidos por rota"].get("/boloes", 0), 3)
+        self.assertGreater(depois["Pedidos por lote"], 0)
+        self.assertIn("p99", depois["Latência (ms)"])
+
+    def test_jogos(self):
+        status, corpo = self.cliente.post("/jogos", {"qtd": 5, "quentes": 10, "frios": 10})
+
+        self.assertEqual(status, 200)
+        for jogo in corpo["jogos"]:
+            self.assertEqual(len(set(jogo)), 15)
+            self.assertTrue(set(jogo) <= set(corpo["base"]))
+            self.assertTrue(190 <= sum(jogo) <= 240)
+
+
+class TestMetricas(unittest.TestCase):
+    def test_vazao_atual_em_janela_deslizante(self):
+        metricas = Metricas(janela_vazao=0.2)
+        for _ in range(50):
+            metricas.registrar_pedido("/boloes", 0.001)
+
+        self.assertGreater(metricas.instantaneo()["Pedidos por segundo (atual)"], 0)
+
+        # Ocioso além da janela: vazão atual zera, a média de vida não
+        time.sleep(0.3)
+        instantaneo = metricas.instantaneo()
+        self.assertEqual(instantaneo["Pedidos por segundo (atual)"], 0.0)
+        self.assertGreater(instantaneo["Pedidos por segundo (média desde o início)"], 0)
+
+
+class TestVazao(unittest.TestCase):
+    # Meta do serviço: milhares de bolões pontuados por segundo num nó.
+    # Limite de 1000/s deixa folga para máquinas lentas (aqui: ~4–6 mil/s)
+    META_BOLOES_POR_SEGUNDO = 1000
+
+    @classmethod
+    def setUpClass(cls):
+        cls.servico = ServicoLotofacil(HISTORICO)
+        cls.cliente = ClienteLocal(criar_aplicacao(cls.servico))
+        rng = np.random.default_rng(7)
+        cls.boloes = [
+            sorted(rng.choice(np.arange(1, 26), k, replace=False).tolist())
+            for k in range(15, 21) for _ in range(50)
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.servico.fechar()
+
+    def test_pedidos_simultaneos_de_um_bolao(self):
+        threads_cliente = 8
+        pedidos_por_thread = 400
+        falhas = []
+
+        def pedir(i):
+            for j in range(pedidos_por_thread):
+                bolao = self.boloes[(i * pedidos_por_thread + j) % len(self.boloes)]
+                if self.cliente.post("/boloes", {"boloes": [bolao], "janela": 300})[0] != 200:
+                    falhas.append(bolao)
+
+        inicio = time.perf_counter()
+        threads = [threading.Thread(target=pedir, args=(i,)) for i in range(threads_cliente)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        vazao = threads_cliente * pedidos_por_thread / (time.perf_counter() - inicio)
+
+        self.assertEqual(falhas, [])
+        self.assertGreaterEqual(vazao, self.META_BOLOES_POR_SEGUNDO)
+        self.assertGreater(self.cliente.get("/metricas")[1]["Pedidos por lote"], 1)
+
+    def test_ranking_ate_18_dezenas(self):
+        boloes = [b for b in self.boloes if len(b) <= 18]
+
+        inicio = time.perf_counter()
+        status, corpo = self.cliente.post("/boloes", {"boloes": boloes, "janela": 300, "ranking": True})
+        vazao = len(boloes) / (time.perf_counter() - inicio)
+
+        self.assertEqual(status, 200)
+        self.assertEqual(len(corpo["ranking"]), len(boloes))
+        self.assertGreaterEqual(vazao, self.META_BOLOES_POR_SEGUNDO)
+
+
+class TestEncerramento(unittest.TestCase):
+    def test_agrupador_fechado_nao_trava(self):
+        servico = ServicoLotofacil(HISTORICO[-100:])
+        servico.fechar()
+
+        with self.assertRaises(RuntimeError):
+            servico.agrupador.acertos(matriz_dezenas([list(range(1, 16))]), 10)
+
+        status, _ = ClienteLocal(criar_aplicacao(servico)).post(
+            "/boloes", {"boloes": [list(range(1, 16))], "janela": 10}
+        )
+        self.assertEqual(status, 500)
+
+
+if __name__ == "__main__":
+    unittest.main()